@@ -1,795 +1,1062 @@
-import os
-import json
-import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
-import math
-
-# --- Constants ---
-SOLUTION_FILENAME = "arc_solutions_log.json" # Stores { "path": ["solved_file1", ...], ... }
-ARC_COLORS = ['#000000'] + [plt.cm.rainbow(i/8) for i in range(9)]
-ARC_COLORS_HEX = [plt.cm.colors.to_hex(c) if isinstance(c, (tuple, list)) else c for c in ARC_COLORS]
-
-# --- Helper Functions ---
-
-def load_data(file_path):
-    # ... (load_data remains the same) ...
-    try:
-        with open(file_path, 'r') as file:
-            return json.load(file)
-    except Exception as e:
-        print(f"Error loading {file_path}: {e}")
-        if 'app' in globals() and app and hasattr(app, 'status_label'):
-             app.status_label.config(text=f"Error loading {os.path.basename(file_path)}: {e}")
-        else:
-             messagebox.showerror("Error", f"Error loading {os.path.basename(file_path)}:\n{e}")
-        return None
-
-def plot_matrix_on_canvas(matrix, title, fig, canvas):
-    # ... (plot_matrix_on_canvas remains the same) ...
-    fig.clear()
-    ax = fig.add_subplot(111)
-    if matrix is None or matrix.size == 0:
-        ax.set_title(f"{title}\n(No data)")
-        ax.set_xticks([]); ax.set_yticks([])
-        canvas.draw(); return
-    rows, cols = matrix.shape
-    cmap = plt.cm.colors.ListedColormap(ARC_COLORS)
-    bounds = [-0.5 + i for i in range(len(ARC_COLORS) + 1)]
-    norm = plt.cm.colors.BoundaryNorm(bounds, cmap.N)
-    mat = ax.matshow(matrix, cmap=cmap, norm=norm)
-    ax.set_title(title, fontsize=10)
-    ax.set_xticks(np.arange(-0.5, cols, 1), minor=True)
-    ax.set_yticks(np.arange(-0.5, rows, 1), minor=True)
-    ax.grid(which='minor', color='grey', linestyle='-', linewidth=0.5)
-    ax.tick_params(which='minor', size=0)
-    ax.set_xticks(np.arange(cols)); ax.set_yticks(np.arange(rows))
-    ax.tick_params(axis='x', bottom=False, top=True, labelbottom=False, labeltop=True, labelsize=8)
-    ax.tick_params(axis='y', left=True, right=False, labelleft=True, labelright=False, labelsize=8)
-    if rows <= 15 and cols <= 15:
-        for i in range(rows):
-            for j in range(cols):
-                color_index = int(matrix[i, j])
-                bgcolor = cmap(norm(color_index))[:3]
-                luminance = 0.299*bgcolor[0] + 0.587*bgcolor[1] + 0.114*bgcolor[2]
-                text_color = 'white' if luminance < 0.5 else 'black'
-                ax.text(j, i, str(color_index), va='center', ha='center', color=text_color, fontsize=6)
-    canvas.draw()
-
-
-# --- Solution Loading/Saving (Handles dict[str, list[str]]) ---
-def load_solutions(filename=SOLUTION_FILENAME):
-    # ... (load_solutions remains the same) ...
-    if os.path.exists(filename):
-        try:
-            with open(filename, 'r') as f:
-                data = json.load(f)
-                if not isinstance(data, dict):
-                    print(f"Warning: Invalid format in {filename} (expected dictionary). Starting empty.")
-                    return {}
-                return data
-        except json.JSONDecodeError:
-            print(f"Warning: Error decoding {filename}. Starting with empty solutions log.")
-            return {}
-        except Exception as e:
-            print(f"Warning: Could not read {filename}: {e}. Starting with empty solutions log.")
-            return {}
-    return {}
-
-def save_solutions(data, filename=SOLUTION_FILENAME):
-    # ... (save_solutions remains the same) ...
-    try:
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=2)
-        return True
-    except Exception as e:
-        print(f"Error saving solutions log to {filename}: {e}")
-        messagebox.showerror("Save Error", f"Could not save solutions log to {filename}:\n{e}")
-        return False
-
-
-# --- GUI Application Class ---
-
-class ARCViewerApp:
-    def __init__(self, master):
-        self.master = master
-        master.title("ARC AGI Dataset Viewer & Solver")
-        master.geometry("1100x850")
-
-        self.directory_path = tk.StringVar()
-        self.selected_file = tk.StringVar()
-        self.json_files = []
-        self._plot_widgets = []
-        self.current_task_data = None
-        self.last_test_input_index = -1
-
-        # Interactive Solver State
-        self.editable_grid_rows = tk.IntVar(value=5) # Default/Initial size
-        self.editable_grid_cols = tk.IntVar(value=5)
-        # RESTORE THIS LINE: Initialize the state array here
-        self.editable_grid_state = np.zeros((5,5), dtype=int)
-        self.current_draw_color = 1
-        self.cell_size = 20
-        # For flicker reduction: store canvas item IDs
-        self._grid_rect_ids = [] # Initialized as empty, populated by create_or_update...
-        self._grid_text_ids = [] # Initialized as empty, populated by create_or_update...
-
-        self.solutions = load_solutions()
-
-        # --- Top Frame for File Selection ---
-        self.top_frame = ttk.Frame(master, padding="10")
-        self.top_frame.pack(fill=tk.X, side=tk.TOP)
-        # ... (Directory/File/Progress widgets remain the same) ...
-        ttk.Label(self.top_frame, text="Directory:").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
-        self.dir_entry = ttk.Entry(self.top_frame, textvariable=self.directory_path, width=60)
-        self.dir_entry.grid(row=0, column=1, padx=5, pady=5, sticky=tk.EW)
-        self.browse_button = ttk.Button(self.top_frame, text="Browse...", command=self.browse_directory)
-        self.browse_button.grid(row=0, column=2, padx=5, pady=5)
-        ttk.Label(self.top_frame, text="Select File:").grid(row=1, column=0, padx=5, pady=5, sticky=tk.W)
-        self.file_combobox = ttk.Combobox(self.top_frame, textvariable=self.selected_file, state="readonly", width=57)
-        self.file_combobox.grid(row=1, column=1, padx=5, pady=5, sticky=tk.EW)
-        self.file_combobox.bind("<<ComboboxSelected>>", self.load_and_display_all)
-        self.progress_label = ttk.Label(self.top_frame, text="Solved: - / - (-.-%)", font=('Helvetica', 10, 'bold'))
-        self.progress_label.grid(row=1, column=2, padx=10, pady=5, sticky=tk.E)
-        self.top_frame.columnconfigure(1, weight=1)
-
-        # --- Status Bar ---
-        self.status_label = ttk.Label(master, text="Load a directory and select a file.", relief=tk.SUNKEN, anchor=tk.W, padding="2 5")
-        self.status_label.pack(side=tk.BOTTOM, fill=tk.X)
-
-        # --- Main Paned Window ---
-        self.paned_window = ttk.PanedWindow(master, orient=tk.VERTICAL)
-        self.paned_window.pack(fill=tk.BOTH, expand=True, side=tk.TOP)
-
-        # --- Top Pane: Scrollable Display Area ---
-        self.display_pane = ttk.Frame(self.paned_window, padding="5")
-        self.paned_window.add(self.display_pane, weight=3)
-        # ... (Canvas/Scrollbar setup for display remains the same) ...
-        self.canvas_display = tk.Canvas(self.display_pane, borderwidth=0)
-        self.scrollable_frame_display = ttk.Frame(self.canvas_display)
-        self.scrollbar_display = ttk.Scrollbar(self.display_pane, orient="vertical", command=self.canvas_display.yview)
-        self.canvas_display.configure(yscrollcommand=self.scrollbar_display.set)
-        self.scrollbar_display.pack(side="right", fill="y")
-        self.canvas_display.pack(side="left", fill="both", expand=True)
-        self.canvas_frame_display_id = self.canvas_display.create_window((0, 0), window=self.scrollable_frame_display, anchor="nw")
-        self.scrollable_frame_display.bind("<Configure>", self._on_display_frame_configure)
-        self.canvas_display.bind('<Configure>', self._on_display_canvas_configure)
-        self.canvas_display.bind("<MouseWheel>", lambda e: self._on_mousewheel(e, self.canvas_display))
-        self.canvas_display.bind("<Button-4>", lambda e: self._on_mousewheel(e, self.canvas_display)) # Linux scroll up
-        self.canvas_display.bind("<Button-5>", lambda e: self._on_mousewheel(e, self.canvas_display)) # Linux scroll down
-
-
-        # --- Bottom Pane: Interactive Solver Area ---
-        self.solver_pane = ttk.Labelframe(self.paned_window, text=" Interactive Solver (Last Test Output) ", padding="10")
-        self.paned_window.add(self.solver_pane, weight=1)
-
-        # --- Solver Control Frame ---
-        solver_controls = ttk.Frame(self.solver_pane)
-        solver_controls.pack(side=tk.LEFT, fill=tk.Y, padx=10)
-
-        # Dimension Controls
-        dim_frame = ttk.Frame(solver_controls)
-        dim_frame.pack(pady=5, anchor='w')
-        # ... (Row/Col entries and Create/Resize button remain the same) ...
-        ttk.Label(dim_frame, text="Rows:").grid(row=0, column=0, padx=2)
-        self.rows_entry = ttk.Entry(dim_frame, textvariable=self.editable_grid_rows, width=4)
-        self.rows_entry.grid(row=0, column=1, padx=2)
-        ttk.Label(dim_frame, text="Cols:").grid(row=0, column=2, padx=2)
-        self.cols_entry = ttk.Entry(dim_frame, textvariable=self.editable_grid_cols, width=4)
-        self.cols_entry.grid(row=0, column=3, padx=2)
-        self.create_grid_button = ttk.Button(dim_frame, text="Create/Resize Grid", command=self.create_or_update_editable_grid, state=tk.DISABLED)
-        self.create_grid_button.grid(row=0, column=4, padx=5)
-
-
-        # Color Palette
-        palette_frame = ttk.Frame(solver_controls)
-        palette_frame.pack(pady=10, anchor='w')
-        # ... (Palette setup remains the same) ...
-        ttk.Label(palette_frame, text="Draw Color:").pack(side=tk.LEFT, padx=(0, 5))
-        self.color_buttons = []
-        for i in range(len(ARC_COLORS_HEX)):
-            btn = tk.Button(palette_frame, text=str(i), bg=ARC_COLORS_HEX[i], width=2, height=1,
-                            relief=tk.RAISED, command=lambda c=i: self.select_draw_color(c))
-            fg_color = 'white' if ARC_COLORS_HEX[i] in ['#000000', '#800080', '#000080'] else 'black'
-            btn.config(fg=fg_color)
-            btn.pack(side=tk.LEFT, padx=1)
-            self.color_buttons.append(btn)
-        self.select_draw_color(self.current_draw_color)
-
-        # Check Button (Renamed)
-        self.check_button = ttk.Button(solver_controls, text="Check Solution", command=self.check_solution, state=tk.DISABLED)
-        self.check_button.pack(pady=10, anchor='w') # Adjusted padding
-
-        # Feedback Label
-        self.check_feedback_label = ttk.Label(solver_controls, text="", font=('Helvetica', 10, 'italic'))
-        self.check_feedback_label.pack(pady=5, anchor='w')
-
-        # --- Editable Grid Canvas Frame ---
-        grid_canvas_frame = ttk.Frame(self.solver_pane)
-        grid_canvas_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10)
-
-        self.canvas_edit = tk.Canvas(grid_canvas_frame, bg='white', borderwidth=1, relief=tk.SUNKEN)
-        self.canvas_edit.pack(fill=tk.BOTH, expand=True)
-        self.canvas_edit.bind("<Button-1>", self.on_grid_click) # Left-click to draw
-        self.canvas_edit.bind("<B1-Motion>", self.on_grid_click) # Drag to draw
-
-    # --- Scroll Setup Methods --- (Remain the same)
-    def _on_display_frame_configure(self, event=None):
-        self.canvas_display.configure(scrollregion=self.canvas_display.bbox("all"))
-    def _on_display_canvas_configure(self, event=None):
-        canvas_width = self.canvas_display.winfo_width()
-        self.canvas_display.itemconfig(self.canvas_frame_display_id, width=canvas_width)
-    def _on_mousewheel(self, event, canvas):
-        delta = 0
-        if event.num == 4: delta = -1
-        elif event.num == 5: delta = 1
-        elif hasattr(event, 'delta') and event.delta < 0: delta = 1
-        elif hasattr(event, 'delta') and event.delta > 0: delta = -1
-        if delta != 0:
-            y_view = canvas.yview()
-            if (delta < 0 and y_view[0] > 0.0) or (delta > 0 and y_view[1] < 1.0):
-                 canvas.yview_scroll(delta, "units")
-
-    # --- Core Application Logic ---
-    def browse_directory(self):
-        # ... (Remains the same, uses normalized path) ...
-        dir_path = filedialog.askdirectory()
-        if dir_path:
-            normalized_dir_path = os.path.normpath(dir_path)
-            self.directory_path.set(normalized_dir_path)
-            self.find_json_files()
-            self.clear_display_area()
-            self.disable_solver()
-            if not self.json_files:
-                 self.status_label.config(text="No .json files found in selected directory.")
-                 self.file_combobox['values'] = []; self.selected_file.set("")
-            else:
-                 self.status_label.config(text="Select a file from the dropdown.")
-
-# --- Inside the ARCViewerApp class ---
-
-    def find_json_files(self):
-        """ Finds .json files, stores the full list, filters dropdown to show only unsolved tasks."""
-        # Keep self.json_files as the full list of files in the directory
-        # Filter only the list shown in the combobox
-        all_json_files_in_dir = [] # Store all found files here
-        dir_path = self.directory_path.get() # Already normalized
-
-        # Clear previous selections first
-        self.selected_file.set("")
-        self.file_combobox['values'] = []
-
-
-        if os.path.isdir(dir_path):
-            try:
-                # Get all .json files
-                all_json_files_in_dir = sorted([
-                    f for f in os.listdir(dir_path) if f.lower().endswith('.json')
-                ])
-                self.json_files = all_json_files_in_dir # Store the full list
-
-                # Get the set of solved files for this directory for efficient lookup
-                solved_files_set = set(self.solutions.get(dir_path, []))
-
-                # Filter the list for the combobox (show only unsolved)
-                unsolved_files = [
-                    f for f in all_json_files_in_dir if f not in solved_files_set
-                ]
-
-                # Update the combobox values
-                self.file_combobox['values'] = unsolved_files
-
-                # Select the first unsolved file, or clear if all are solved
-                if unsolved_files:
-                    self.selected_file.set(unsolved_files[0])
-                    # Automatically load the first unsolved file
-                    # Ensure load_and_display_all is called AFTER the selection is set
-                    # Binding <<ComboboxSelected>> might handle this, but explicit call is safer here
-                    # Using after(0) ensures the set() completes before loading starts
-                    self.master.after(0, self.load_and_display_all)
-                else:
-                    # All tasks solved or directory empty of JSON files
-                    self.clear_display_area() # Clear plots if no file selected
-                    self.disable_solver()    # Disable solver
-                    if all_json_files_in_dir: # Files exist, but all are solved
-                        self.status_label.config(text="All tasks in this directory are marked as solved!")
-                    # else: status handled by browse_directory if directory was empty initially
-
-            except Exception as e:
-                self.status_label.config(text=f"Error reading directory: {e}")
-                self.json_files = [] # Reset full list on error too
-                self.selected_file.set("")
-                self.file_combobox['values'] = []
-        else:
-            # Directory path is invalid
-            self.json_files = []
-            self.selected_file.set("")
-            self.file_combobox['values'] = []
-
-        # Update progress based on the full list (self.json_files) vs solutions log
-        # This should be called AFTER self.json_files is updated
-        self.update_solved_percentage()
-
-    def clear_display_area(self):
-        # ... (Remains the same) ...
-        for widget in self.scrollable_frame_display.winfo_children(): widget.destroy()
-        self._plot_widgets = []
-        self.canvas_display.yview_moveto(0)
-        self.master.after(10, self._on_display_frame_configure)
-
-    # --- Inside disable_solver method ---
-    def disable_solver(self):
-        """ Disables solver elements and clears feedback. """
-        self.create_grid_button.config(state=tk.DISABLED)
-        self.check_button.config(state=tk.DISABLED) # Use new button name
-        self.check_feedback_label.config(text="") # Clear feedback
-        self.last_test_input_index = -1
-
-        # Set state and IntVars to minimal 1x1
-        self.editable_grid_state = np.zeros((1,1), dtype=int)
-        self.editable_grid_rows.set(1); self.editable_grid_cols.set(1)
-
-        # Clear canvas items fully
-        self.canvas_edit.delete("all")
-        # CORRECT Initialisation for 1x1 grid
-        self._grid_rect_ids = [[None]]
-        self._grid_text_ids = [[None]]
-
-        # Draw the minimal empty 1x1 grid
-        self.draw_editable_grid()
-
-    def enable_solver(self, last_test_index, initial_rows, initial_cols):
-        """ Enables solver elements, sets initial state, clears feedback. """
-        self.last_test_input_index = last_test_index
-        self.editable_grid_rows.set(initial_rows)
-        self.editable_grid_cols.set(initial_cols)
-        self.create_or_update_editable_grid(clear_state=True)
-        self.create_grid_button.config(state=tk.NORMAL)
-        self.check_button.config(state=tk.NORMAL) # Use new button name
-        self.check_feedback_label.config(text="") # Clear feedback
-
-
-   # --- Inside the ARCViewerApp class ---
-
-    def load_and_display_all(self, event=None):
-        """ Loads file, displays ALL examples (Train & Test), prepares solver. """
-        file_name = self.selected_file.get()
-        current_dir = self.directory_path.get() # Get normalized path
-        if not file_name or not current_dir: return
-
-        file_path = os.path.join(current_dir, file_name)
-        self.status_label.config(text=f"Loading {file_name}...")
-        self.master.update_idletasks()
-
-        self.clear_display_area()
-        self.disable_solver() # Disable solver initially
-
-        self.current_task_data = load_data(file_path) # Store current task data
-        if not self.current_task_data:
-            # Error handling done within load_data or subsequent checks
-            self.status_label.config(text=f"Failed to load or parse {file_name}")
-            return
-
-        self._plot_widgets = []
-        # Use .get with default empty list for safety
-        train_examples = self.current_task_data.get('train', [])
-        test_examples = self.current_task_data.get('test', [])
-        num_train = len(train_examples)
-        num_test = len(test_examples)
-
-        if num_train + num_test == 0:
-            self.status_label.config(text=f"Loaded {file_name}: No examples found.")
-            ttk.Label(self.scrollable_frame_display, text="No examples found in this file.").pack(pady=20)
-            # Ensure scroll region is updated even if empty
-            self.master.after(10, self._on_display_frame_configure)
-            return
-
-        plot_height, plot_width, dpi = 3.5, 3.5, 96
-
-        # --- Plot Training Examples --- (RESTORED BLOCK)
-        if num_train > 0:
-            train_label = ttk.Label(self.scrollable_frame_display, text="--- Training Examples ---", font=('Helvetica', 12, 'bold'))
-            train_label.pack(pady=(10, 5), anchor='w', padx=10)
-            self._plot_widgets.append(train_label)
-
-            for i, pair in enumerate(train_examples): # Use the fetched train_examples list
-                pair_frame = ttk.Frame(self.scrollable_frame_display, padding=5, relief=tk.GROOVE, borderwidth=1)
-                pair_frame.pack(fill=tk.X, pady=5, padx=5)
-                self._plot_widgets.append(pair_frame)
-
-                input_matrix = np.array(pair.get('input', []))
-                output_matrix = np.array(pair.get('output', []))
-
-                # Input Plot
-                fig_in = Figure(figsize=(plot_width, plot_height), dpi=dpi)
-                canvas_in = FigureCanvasTkAgg(fig_in, master=pair_frame)
-                widget_in = canvas_in.get_tk_widget()
-                widget_in.pack(side=tk.LEFT, padx=5, pady=5, expand=False)
-                plot_matrix_on_canvas(input_matrix, f"Train {i+1} Input", fig_in, canvas_in)
-
-                # Output Plot
-                fig_out = Figure(figsize=(plot_width, plot_height), dpi=dpi)
-                canvas_out = FigureCanvasTkAgg(fig_out, master=pair_frame)
-                widget_out = canvas_out.get_tk_widget()
-                widget_out.pack(side=tk.LEFT, padx=5, pady=5, expand=False)
-                plot_matrix_on_canvas(output_matrix, f"Train {i+1} Output", fig_out, canvas_out)
-
-                # Store references
-                self._plot_widgets.extend([widget_in, widget_out, canvas_in, canvas_out, fig_in, fig_out])
-        # --- End of RESTORED BLOCK ---
-
-
-        # --- Plot Test Examples --- (Remains the same as last correct version)
-        if num_test > 0:
-            test_label = ttk.Label(self.scrollable_frame_display, text="--- Test Examples ---", font=('Helvetica', 12, 'bold'))
-            test_label.pack(pady=(15, 5), anchor='w', padx=10)
-            self._plot_widgets.append(test_label)
-
-            last_test_input_index = num_test - 1
-
-            for i, pair in enumerate(test_examples): # Use the fetched test_examples list
-                is_last_test = (i == last_test_input_index)
-
-                pair_frame = ttk.Frame(self.scrollable_frame_display, padding=5, relief=tk.GROOVE, borderwidth=1)
-                pair_frame.pack(fill=tk.X, pady=5, padx=5)
-                self._plot_widgets.append(pair_frame)
-
-                # Plot Input
-                input_matrix = np.array(pair.get('input', []))
-                fig_in = Figure(figsize=(plot_width, plot_height), dpi=dpi)
-                canvas_in = FigureCanvasTkAgg(fig_in, master=pair_frame)
-                widget_in = canvas_in.get_tk_widget()
-                widget_in.pack(side=tk.LEFT, padx=5, pady=5, expand=False)
-                plot_matrix_on_canvas(input_matrix, f"Test {i+1} Input", fig_in, canvas_in)
-                self._plot_widgets.extend([widget_in, canvas_in, fig_in])
-
-                # Plot Output or Placeholder (Always placeholder for last)
-                output_matrix = np.array(pair.get('output', [])) if 'output' in pair else None
-                if is_last_test or output_matrix is None:
-                    ph_text = f"Test {i+1} Output\n(To be predicted)"
-                    ph = ttk.Label(pair_frame, text=ph_text, relief=tk.SOLID, padding=10, borderwidth=1, justify=tk.CENTER)
-                    ph.pack(side=tk.LEFT, padx=5, pady=5, expand=True, fill=tk.BOTH)
-                    self._plot_widgets.append(ph)
-                else:
-                    fig_out = Figure(figsize=(plot_width, plot_height), dpi=dpi)
-                    canvas_out = FigureCanvasTkAgg(fig_out, master=pair_frame)
-                    widget_out = canvas_out.get_tk_widget()
-                    widget_out.pack(side=tk.LEFT, padx=5, pady=5, expand=False)
-                    plot_matrix_on_canvas(output_matrix, f"Test {i+1} Output", fig_out, canvas_out)
-                    self._plot_widgets.extend([widget_out, canvas_out, fig_out])
-
-                # Determine Solver Size and Enable (if last test example)
-                if is_last_test:
-                    # ... (solver dimension determination logic remains the same) ...
-                    expected_rows, expected_cols = 3, 3
-                    determined_from_training = False
-                    if num_train > 0: # Check training outputs (use num_train check)
-                         train_outputs_np = [np.array(tr_pair.get('output', [])) for tr_pair in train_examples] # Use train_examples
-                         valid_train_outputs = [out for out in train_outputs_np if out.ndim == 2 and out.size > 0]
-                         if valid_train_outputs:
-                            first_shape = valid_train_outputs[0].shape
-                            if all(out.shape == first_shape for out in valid_train_outputs):
-                                expected_rows, expected_cols = first_shape
-                                determined_from_training = True
-                                print(f"Solver size: Using consistent training output dimensions: {expected_rows}x{expected_cols}")
-                            else: print("Solver size: Training output dimensions are inconsistent.")
-                    if not determined_from_training: # Fallback to input
-                         if input_matrix.ndim == 2 and input_matrix.size > 0:
-                            expected_rows, expected_cols = input_matrix.shape
-                            print(f"Solver size: Falling back to input dimensions: {expected_rows}x{expected_cols}")
-                         else: # Absolute fallback
-                             expected_rows, expected_cols = 3, 3
-                             print(f"Solver size: Falling back to default dimensions: {expected_rows}x{expected_cols}")
-                    self.enable_solver(i, expected_rows, expected_cols)
-
-        # --- Final Updates ---
-        self.status_label.config(text=f"Loaded {file_name}: {num_train} train, {num_test} test examples.")
-        self.master.update_idletasks()
-        self.master.after(10, self._on_display_frame_configure) # Ensure scroll region updates
-        self.canvas_display.yview_moveto(0) # Scroll display to top
-
-
-    # --- Interactive Solver Methods ---
-    def select_draw_color(self, color_index):
-        # ... (Remains the same) ...
-        self.current_draw_color = color_index
-        for i, btn in enumerate(self.color_buttons):
-            relief = tk.SUNKEN if i == color_index else tk.RAISED
-            border = 2 if i == color_index else 1
-            btn.config(relief=relief, borderwidth=border)
-
-
-    def create_or_update_editable_grid(self, clear_state=False):
-        """ Resizes internal state, clears canvas, initializes ID storage, and redraws. """
-        try:
-            rows = int(self.editable_grid_rows.get())
-            cols = int(self.editable_grid_cols.get())
-            if not (0 < rows <= 50 and 0 < cols <= 50):
-                 raise ValueError("Grid dimensions must be between 1 and 50.")
-        except ValueError as e:
-            messagebox.showerror("Invalid Dimensions", f"Please enter valid integer dimensions (1-50).\n{e}")
-            if hasattr(self.editable_grid_state, 'shape'):
-                self.editable_grid_rows.set(self.editable_grid_state.shape[0])
-                self.editable_grid_cols.set(self.editable_grid_state.shape[1])
-            return
-
-        # Always clear canvas items fully on resize/create
-        self.canvas_edit.delete("all")
-        # Initialize/Resize ID storage before drawing
-        self._grid_rect_ids = [[None for _ in range(cols)] for _ in range(rows)]
-        self._grid_text_ids = [[None for _ in range(cols)] for _ in range(rows)]
-
-        # Update internal grid state only if size changed or clear requested
-        if clear_state or (rows, cols) != self.editable_grid_state.shape:
-            print(f"Creating new solver grid state: {rows}x{cols}")
-            self.editable_grid_state = np.zeros((rows, cols), dtype=int)
-        else:
-             # If size is same, ensure state matches new dimensions (e.g., trim/pad if logic was complex)
-             # For simple resize, zeros is fine if size changed, otherwise keep existing state
-             pass
-
-        # Always redraw the canvas fully after resize/create
-        self.draw_editable_grid()
-
-
-    def draw_editable_grid(self):
-        """ Draws the editable grid on the canvas, storing item IDs. """
-        # NOTE: Assumes canvas is clear and ID storage (_grid_rect_ids/_grid_text_ids) is sized correctly.
-        # Called by create_or_update_editable_grid or root.after_idle initially.
-        rows, cols = self.editable_grid_state.shape
-        if rows == 0 or cols == 0: return
-
-        self.canvas_edit.update_idletasks()
-        canvas_width = self.canvas_edit.winfo_width() - 4
-        canvas_height = self.canvas_edit.winfo_height() - 4
-        if canvas_width <= 0 or canvas_height <= 0:
-             self.master.after(100, self.draw_editable_grid); return # Try again later
-
-        cell_w = max(1, math.floor(canvas_width / cols))
-        cell_h = max(1, math.floor(canvas_height / rows))
-        self.cell_size = min(cell_w, cell_h, 50)
-
-        grid_width = self.cell_size * cols; grid_height = self.cell_size * rows
-        offset_x = max(2, (canvas_width - grid_width) // 2)
-        offset_y = max(2, (canvas_height - grid_height) // 2)
-
-        for r in range(rows):
-            for c in range(cols):
-                x1, y1 = offset_x + c * self.cell_size, offset_y + r * self.cell_size
-                x2, y2 = x1 + self.cell_size, y1 + self.cell_size
-                color_index = self.editable_grid_state[r, c]
-                if not (0 <= color_index < len(ARC_COLORS_HEX)): color_index = 0
-                fill_color = ARC_COLORS_HEX[color_index]
-
-                # Create rectangle and store ID
-                rect_id = self.canvas_edit.create_rectangle(x1, y1, x2, y2, fill=fill_color, outline='grey', width=1)
-                self._grid_rect_ids[r][c] = rect_id
-
-                # Create text and store ID (optional based on size)
-                if self.cell_size > 12:
-                     text_color = 'white' if fill_color in ['#000000', '#800080', '#000080'] else 'black'
-                     text_content = str(color_index)
-                     text_id = self.canvas_edit.create_text(x1 + self.cell_size/2, y1 + self.cell_size/2,
-                                                            text=text_content, fill=text_color,
-                                                            font=('Helvetica', max(6, int(self.cell_size * 0.4))),
-                                                            tags=f"cell_{r}_{c}_text") # Add tag for potential easier access
-                     self._grid_text_ids[r][c] = text_id
-                else:
-                    self._grid_text_ids[r][c] = None # No text item for this cell
-
-
-    def on_grid_click(self, event):
-        """ Handles clicks/drags: Updates state and uses itemconfig for minimal redraw. """
-        if self.check_button['state'] == tk.DISABLED: return # Use check_button name
-
-        rows, cols = self.editable_grid_state.shape
-        if rows <= 0 or cols <= 0: return # Grid not initialized
-
-        # --- Recalculate geometry INSIDE the handler for accuracy ---
-        # Ensure canvas dimensions are up-to-date
-        self.canvas_edit.update_idletasks()
-        canvas_width = self.canvas_edit.winfo_width() - 4 # Account for border? Adjust if needed.
-        canvas_height = self.canvas_edit.winfo_height() - 4
-
-        if canvas_width <= 0 or canvas_height <= 0:
-            print("Warning: Canvas size invalid in on_grid_click.")
-            return # Cannot calculate if canvas size is invalid
-
-        # Recalculate cell size based on current dimensions and grid cols/rows
-        # Mirror the logic from draw_editable_grid
-        current_cell_w = max(1, math.floor(canvas_width / cols))
-        current_cell_h = max(1, math.floor(canvas_height / rows))
-        # Use local calculation for cell size for this specific click event
-        local_cell_size = min(current_cell_w, current_cell_h, 50) # Use smaller dimension, cap max size
-
-        if local_cell_size <= 0:
-            print("Warning: local_cell_size is invalid in on_grid_click.")
-            return # Cannot calculate if cell_size is invalid
-
-        # Recalculate offsets using the locally calculated cell size
-        current_grid_width = local_cell_size * cols
-        current_grid_height = local_cell_size * rows
-        current_offset_x = max(2, (canvas_width - current_grid_width) // 2)
-        current_offset_y = max(2, (canvas_height - current_grid_height) // 2)
-        # --- End Recalculation ---
-
-        # Calculate column and row based on click position relative to grid origin
-        # Using the recalculated offsets and the locally calculated cell size
-        c = (event.x - current_offset_x) // local_cell_size
-        r = (event.y - current_offset_y) // local_cell_size
-
-        # Clamp indices to be within valid range AFTER calculation
-        c = max(0, min(cols - 1, c))
-        r = max(0, min(rows - 1, r))
-
-        # --- Optional diagnostic prints ---
-        # print(f"Click: ({event.x}, {event.y}), CanvasW/H: ({canvas_width+4}, {canvas_height+4})")
-        # print(f"GridR/C: ({rows}, {cols}), LocalCellSize: {local_cell_size}")
-        # print(f"GridW/H: ({current_grid_width}, {current_grid_height}), OffsetX/Y: ({current_offset_x}, {current_offset_y})")
-        # print(f"Clamped Cell: (r={r}, c={c})")
-        # --- End diagnostic prints ---
-
-
-        # Check if the click physical location is roughly within the drawn grid bounds
-        # This helps ignore clicks in margin/padding if calculation is slightly off
-        click_in_grid_x = (current_offset_x <= event.x < current_offset_x + current_grid_width)
-        click_in_grid_y = (current_offset_y <= event.y < current_offset_y + current_grid_height)
-
-        if click_in_grid_x and click_in_grid_y:
-            # Update internal state only if color is different
-            if self.editable_grid_state[r, c] != self.current_draw_color:
-                self.editable_grid_state[r, c] = self.current_draw_color
-                new_color_idx = self.current_draw_color
-                new_color_hex = ARC_COLORS_HEX[new_color_idx]
-
-                # --- Update Canvas Item using itemconfig ---
-                # Check if ID lists have been initialized correctly (should match rows/cols)
-                # Add extra safety check for list structure
-                if r < len(self._grid_rect_ids) and self._grid_rect_ids[r] is not None and c < len(self._grid_rect_ids[r]):
-                    rect_id = self._grid_rect_ids[r][c]
-                    if rect_id is not None:
-                        self.canvas_edit.itemconfig(rect_id, fill=new_color_hex)
-                    else: print(f"Warning: rect_id is None at ({r},{c})") # Debug missing ID
-                else:
-                    print(f"Warning: rect_id index out of bounds or row not initialized ({r},{c})")
-
-                if r < len(self._grid_text_ids) and self._grid_text_ids[r] is not None and c < len(self._grid_text_ids[r]):
-                    text_id = self._grid_text_ids[r][c]
-                    if text_id is not None: # Update text only if it exists
-                        new_text_color = 'white' if new_color_hex in ['#000000', '#800080', '#000080'] else 'black'
-                        self.canvas_edit.itemconfig(text_id, text=str(new_color_idx), fill=new_text_color)
-                    # else: print(f"Warning: text_id is None at ({r},{c})") # Text might legitimately be None if cell too small
-                else:
-                     print(f"Warning: text_id index out of bounds or row not initialized ({r},{c})")
-
-                # Clear feedback label when user draws, as previous check is now invalid
-                self.check_feedback_label.config(text="")
-        # else: print(f"Click ({event.x},{event.y}) was outside calculated grid bounds") # Optional debug
-
-
-    def check_solution(self):
-        """ Checks the drawn grid against the correct output and provides feedback.
-            Only marks as solved if correct. """
-        current_file = self.selected_file.get()
-        current_dir = self.directory_path.get()
-
-        # --- Basic Checks ---
-        if not current_file or not current_dir:
-            messagebox.showwarning("No Task", "No directory or task file selected.")
-            return
-        if self.last_test_input_index < 0:
-             messagebox.showwarning("No Test Case", "Solver not linked to a specific test case.")
-             return
-        if self.current_task_data is None or 'test' not in self.current_task_data:
-             messagebox.showerror("Error", "Task data not loaded correctly.")
-             return
-        if not (0 <= self.last_test_input_index < len(self.current_task_data['test'])):
-             messagebox.showerror("Error", "Invalid test case index.")
-             return
-
-        # --- Get Correct Output ---
-        try:
-            correct_pair = self.current_task_data['test'][self.last_test_input_index]
-            if 'output' not in correct_pair:
-                self.check_feedback_label.config(text="Cannot check: Correct output not available.", foreground="orange")
-                messagebox.showinfo("Cannot Check", "The correct output for this test case is not included in the loaded task data.")
-                return
-            correct_grid_np = np.array(correct_pair['output'])
-        except Exception as e:
-             messagebox.showerror("Error", f"Could not get correct output data: {e}")
-             self.check_feedback_label.config(text="Error accessing correct output.", foreground="red")
-             return
-
-        # --- Compare Grids ---
-        user_grid_np = self.editable_grid_state
-        is_correct = False
-        feedback_text = ""
-        feedback_color = "red" # Default to incorrect
-
-        if user_grid_np.shape != correct_grid_np.shape:
-            feedback_text = f"Incorrect (Wrong dimensions: {user_grid_np.shape} vs {correct_grid_np.shape})"
-        elif np.array_equal(user_grid_np, correct_grid_np):
-            is_correct = True
-            feedback_text = "Correct!"
-            feedback_color = "green"
-        else:
-            feedback_text = "Incorrect (Content mismatch)"
-
-        # --- Update Feedback Label ---
-        self.check_feedback_label.config(text=feedback_text, foreground=feedback_color)
-
-        # --- Mark as Solved (only if correct) ---
-        if is_correct:
-            self._mark_task_as_solved(current_dir, current_file)
-
-
-# --- Inside the ARCViewerApp class ---
-
-    def _mark_task_as_solved(self, current_dir, current_file):
-        """ Internal helper to log task as solved and save. """
-        solved_list = self.solutions.setdefault(current_dir, [])
-        needs_refresh = False # Flag to check if list actually changed
-        if current_file not in solved_list:
-            solved_list.append(current_file)
-            solved_list.sort()
-            needs_refresh = True # Mark that we need to refresh the list later
-            # Note: self.solutions is updated here by setdefault/append
-
-        # Always try to save, even if already solved (in case file was corrupt before)
-        # But only refresh the list if it was newly added
-        if save_solutions(self.solutions, SOLUTION_FILENAME):
-            print(f"Task '{current_file}' status updated in solutions log.")
-            # Update status bar to confirm it's correct
-            status_msg = f"Correct! Task '{current_file}' marked as solved."
-            if not needs_refresh:
-                 status_msg = f"Correct! (Task was already marked as solved)."
-            self.status_label.config(text=status_msg)
-
-            if needs_refresh:
-                # Refresh the file list dropdown AFTER saving successfully
-                # This also recalculates percentage and loads the next unsolved task
-                self.find_json_files()
-            else:
-                 # If already solved, just update percentage in case json_files list changed
-                 self.update_solved_percentage()
-
-        else: # Save failed
-             self.status_label.config(text=f"Correct, but failed to save solution log.")
-             # Revert the change in memory if save failed AND if it was newly added
-             if needs_refresh and current_dir in self.solutions and current_file in self.solutions[current_dir]:
-                self.solutions[current_dir].remove(current_file)
-                if not self.solutions[current_dir]: del self.solutions[current_dir]
-
-
-    def update_solved_percentage(self):
-        # ... (Remains the same as previous version) ...
-        current_dir = self.directory_path.get()
-        if not current_dir or not os.path.isdir(current_dir) or not self.json_files:
-            self.progress_label.config(text="Solved: - / - (-.-%)"); return
-        total_tasks_in_dir = len(self.json_files)
-        if total_tasks_in_dir == 0:
-             self.progress_label.config(text="Solved: 0 / 0 (0.0%)"); return
-        solved_filenames_for_dir = self.solutions.get(current_dir, [])
-        present_files_set = set(self.json_files)
-        solved_files_set = set(solved_filenames_for_dir)
-        solved_count = len(present_files_set.intersection(solved_files_set))
-        percent = (solved_count / total_tasks_in_dir) * 100
-        progress_text = f"Solved: {solved_count} / {total_tasks_in_dir} ({percent:.1f}%)"
-        self.progress_label.config(text=progress_text)
-
-
-# --- Main Execution ---
-if __name__ == "__main__":
-    root = tk.Tk()
-    # Define app instance globally ONLY if needed by helpers like load_data
-    # It's generally better to pass 'app' or 'status_label' explicitly if required
-    app = ARCViewerApp(root)
-
-    # Schedule the INITIAL grid creation and drawing AFTER the window is ready
-    # This ensures canvas has size and ID lists are correctly initialized.
-    root.after_idle(app.create_or_update_editable_grid) # CORRECTED LINE
-
+import os
+import json
+import threading
+try:
+    import orjson # much faster JSON encode/decode; optional
+except ImportError:
+    orjson = None
+import numpy as np
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+from solver_kernels import grids_equal
+
+# --- Constants ---
+SOLUTION_FILENAME = "arc_solutions_log.json" # Stores { "path": ["solved_file1", ...], ... }
+# In memory the solved files are kept as dict[str, set[str]]; the sets are
+# serialized back to sorted lists by save_solutions.
+# The canonical ARC palette, hardcoded so startup doesn't have to
+# initialize matplotlib's colormap machinery just to derive 10 colors
+ARC_COLORS_HEX = ('#000000', '#0074D9', '#FF4136', '#2ECC40', '#FFDC00',
+                  '#AAAAAA', '#F012BE', '#FF851B', '#7FDBFF', '#870C25')
+
+def _hex_to_rgb(hex_color):
+    """ '#RRGGBB' -> (r, g, b) uint8 triple. """
+    h = hex_color.lstrip('#')
+    return tuple(int(h[i:i+2], 16) for i in (0, 2, 4))
+
+# Palette lookup table for rendering grids as raw RGB pixel buffers.
+PALETTE_RGB = np.array([_hex_to_rgb(c) for c in ARC_COLORS_HEX], dtype=np.uint8)
+GRID_LINE_RGB = (128, 128, 128) # grey, matches the old rectangle outlines
+
+# Per-color luminance and overlay text color, computed once instead of per cell
+_ARC_RGB = PALETTE_RGB / 255.0
+_ARC_LUM = _ARC_RGB @ np.array([0.299, 0.587, 0.114])
+_ARC_TEXT = np.where(_ARC_LUM < 0.5, 'white', 'black')
+# Same contrast rule as an RGB triple, for stamping digits into pixel buffers
+_TEXT_RGB = np.where(_ARC_LUM[:, None] < 0.5, 255, 0).astype(np.uint8)
+# ...and as plain Tk color names/hex, indexed directly by color index
+TEXT_COLOR_FOR_IDX = tuple(_ARC_TEXT.tolist())
+_TEXT_HEX_FOR_IDX = tuple('#FFFFFF' if t == 'white' else '#000000' for t in TEXT_COLOR_FOR_IDX)
+# (fill, contrasting text) hex pair per color index - one lookup on the draw path
+PAINT_HEX = tuple(zip(ARC_COLORS_HEX, _TEXT_HEX_FOR_IDX))
+
+# 5x7 bitmaps for digits 0-9, padded into (10, 8, 8) boolean stamps
+_DIGIT_PATTERNS = (
+    "01110 10001 10011 10101 11001 10001 01110", # 0
+    "00100 01100 00100 00100 00100 00100 01110", # 1
+    "01110 10001 00001 00010 00100 01000 11111", # 2
+    "11111 00010 00100 00010 00001 10001 01110", # 3
+    "00010 00110 01010 10010 11111 00010 00010", # 4
+    "11111 10000 11110 00001 00001 10001 01110", # 5
+    "00110 01000 10000 11110 10001 10001 01110", # 6
+    "11111 00001 00010 00100 01000 01000 01000", # 7
+    "01110 10001 10001 01110 10001 10001 01110", # 8
+    "01110 10001 10001 01111 00001 00010 01100", # 9
+)
+
+def _build_digit_glyphs():
+    glyphs = np.zeros((10, 8, 8), dtype=bool)
+    for digit, pattern in enumerate(_DIGIT_PATTERNS):
+        for r, row in enumerate(pattern.split()):
+            for c, bit in enumerate(row):
+                glyphs[digit, r, c + 1] = (bit == '1')
+    return glyphs
+
+_DIGIT_GLYPHS = _build_digit_glyphs()
+DIGIT_MIN_CELL_PX = 13 # below this, cells are too small for a readable digit
+
+THUMB_TARGET_PX = 336 # ~matches the old 3.5in x 96dpi matplotlib figures
+
+def _thumb_cell_size(matrix):
+    """ Cell size (px) so a thumbnail roughly fills the old figure footprint. """
+    rows, cols = matrix.shape
+    return max(3, min(24, THUMB_TARGET_PX // max(rows, cols, 1)))
+
+def _stamp_digits(img, safe, cell):
+    """ Stamps the 8x8 digit glyph of each cell's color index into img. """
+    offset = (cell - 8) // 2 + 1
+    rows, cols = safe.shape
+    # Pixel origins computed once per row/column instead of multiplying
+    # inside the per-cell loop
+    ys = (np.arange(rows) * cell + offset).tolist()
+    xs = (np.arange(cols) * cell + offset).tolist()
+    # Bind the lookup tables to locals: global LOAD_ATTR/LOAD_GLOBAL in a
+    # per-cell loop is measurable on 30x30 grids
+    glyphs = _DIGIT_GLYPHS
+    text_rgb = _TEXT_RGB
+    for r in range(rows):
+        y = ys[r]
+        row = safe[r]
+        for c in range(cols):
+            idx = row[c]
+            x = xs[c]
+            img[y:y+8, x:x+8][glyphs[idx]] = text_rgb[idx]
+
+def render_grid_photo(matrix, cell=16, show_numbers=True):
+    """ Renders an ARC grid straight into a Tk PhotoImage.
+
+    Avoids the fixed axes/ticks/font cost of a matplotlib figure: one palette
+    lookup, an np.repeat upscale, grid lines, optional digit stamps, and a
+    single PPM conversion. """
+    rows, cols = matrix.shape
+    safe = np.clip(matrix.astype(np.intp), 0, len(ARC_COLORS_HEX) - 1)
+    img = np.empty((rows * cell + 1, cols * cell + 1, 3), dtype=np.uint8)
+    img[:-1, :-1] = np.repeat(np.repeat(PALETTE_RGB[safe], cell, axis=0), cell, axis=1)
+    img[::cell, :] = GRID_LINE_RGB
+    img[:, ::cell] = GRID_LINE_RGB
+    img[-1, :] = GRID_LINE_RGB
+    img[:, -1] = GRID_LINE_RGB
+    if show_numbers and cell >= 10 and rows <= 15 and cols <= 15:
+        _stamp_digits(img, safe, cell)
+    h, w = img.shape[:2]
+    return tk.PhotoImage(data=f"P6 {w} {h} 255 ".encode('ascii') + img.tobytes())
+
+# --- Helper Functions ---
+
+def to_grid(lst):
+    """ Converts a parsed JSON grid (list of row lists) to a dense int8 array.
+
+    Preallocates and fills row-by-row, skipping numpy's recursive structure
+    detection and per-element boxing on nested Python lists. """
+    rows = len(lst)
+    cols = len(lst[0]) if rows else 0
+    arr = np.empty((rows, cols), dtype=np.int8)
+    for i, row in enumerate(lst):
+        arr[i] = row
+    return arr
+
+def load_data(file_path):
+    try:
+        with open(file_path, 'rb') as file:
+            raw = file.read()
+        return orjson.loads(raw) if orjson else json.loads(raw)
+    except Exception as e:
+        print(f"Error loading {file_path}: {e}")
+        if 'app' in globals() and app and hasattr(app, 'status_label'):
+             app.status_label.config(text=f"Error loading {os.path.basename(file_path)}: {e}")
+        else:
+             messagebox.showerror("Error", f"Error loading {os.path.basename(file_path)}:\n{e}")
+        return None
+
+# --- Solution Loading/Saving (Handles dict[str, list[str]]) ---
+def load_solutions(filename=SOLUTION_FILENAME):
+    if os.path.exists(filename):
+        try:
+            with open(filename, 'rb') as f:
+                raw = f.read()
+            data = orjson.loads(raw) if orjson else json.loads(raw)
+            if not isinstance(data, dict):
+                print(f"Warning: Invalid format in {filename} (expected dictionary). Starting empty.")
+                return {}
+            return data
+        except ValueError: # covers both json.JSONDecodeError and orjson.JSONDecodeError
+            print(f"Warning: Error decoding {filename}. Starting with empty solutions log.")
+            return {}
+        except Exception as e:
+            print(f"Warning: Could not read {filename}: {e}. Starting with empty solutions log.")
+            return {}
+    return {}
+
+def save_solutions(data, filename=SOLUTION_FILENAME, show_error=True):
+    # show_error=False when called from a worker thread - Tk dialogs must
+    # only be raised from the UI thread (the caller reports failure there)
+    try:
+        # Ordering is produced here, once per save; in memory the solved
+        # files live in sets, so inserts never re-sort
+        payload = {k: sorted(v) for k, v in data.items()}
+        if orjson:
+            encoded = orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+        else:
+            encoded = json.dumps(payload, indent=2).encode('utf-8')
+        with open(filename, 'wb') as f:
+            f.write(encoded)
+        return True
+    except Exception as e:
+        print(f"Error saving solutions log to {filename}: {e}")
+        if show_error:
+            messagebox.showerror("Save Error", f"Could not save solutions log to {filename}:\n{e}")
+        return False
+
+
+# --- GUI Application Class ---
+
+class ARCViewerApp:
+    def __init__(self, master):
+        self.master = master
+        master.title("ARC AGI Dataset Viewer & Solver")
+        master.geometry("1100x850")
+
+        self.directory_path = tk.StringVar()
+        self.selected_file = tk.StringVar()
+        self.json_files = []
+        self._json_files_set = frozenset() # set view of json_files, kept in sync
+        # Pooled display widgets: Tk widget creation is expensive, so slots
+        # are created once and re-pointed at new data on each load.
+        self._fig_pool = []
+        self._train_header = None
+        self._test_header = None
+        self._pack_prev = None # last display row packed by _pack_in_order
+        self.current_task_data = None
+        self.last_test_input_index = -1
+        self._correct_grids_np = [] # parsed test outputs, aligned with test index
+
+        # Interactive Solver State
+        self.editable_grid_rows = tk.IntVar(value=5) # Default/Initial size
+        self.editable_grid_cols = tk.IntVar(value=5)
+        # RESTORE THIS LINE: Initialize the state array here
+        self.editable_grid_state = np.zeros((5,5), dtype=np.int8)
+        self.current_draw_color = np.int8(1) # same dtype as the grid state
+        self.cell_size = 20
+        # Editable grid is rendered as ONE PhotoImage canvas item instead of
+        # per-cell rectangles; keep references so Tk doesn't GC the image.
+        self._grid_img_id = None
+        self._grid_photo = None
+        self._last_drawn_cell = None # (r, c) guard so same-cell motion events are no-ops
+        self._feedback_cleared = True # label empty? skips redundant clears while drawing
+        self._refresh_after_id = None # pending debounced file-list refresh, if any
+        self._solved_count_per_dir = {} # memoized solved-and-present count per dir
+        self._dirty_cells = set() # cells awaiting repaint, flushed once per idle tick
+        self._flush_scheduled = False
+        self._edit_geom = None # cached ((rows, cols), (cell_size, offset_x, offset_y))
+
+        # Sets give O(1) membership tests in the browse/solve hot paths
+        self.solutions = {k: set(v) for k, v in load_solutions().items()}
+
+        # --- Top Frame for File Selection ---
+        self.top_frame = ttk.Frame(master, padding="10")
+        self.top_frame.pack(fill=tk.X, side=tk.TOP)
+        # ... (Directory/File/Progress widgets remain the same) ...
+        ttk.Label(self.top_frame, text="Directory:").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
+        self.dir_entry = ttk.Entry(self.top_frame, textvariable=self.directory_path, width=60)
+        self.dir_entry.grid(row=0, column=1, padx=5, pady=5, sticky=tk.EW)
+        self.browse_button = ttk.Button(self.top_frame, text="Browse...", command=self.browse_directory)
+        self.browse_button.grid(row=0, column=2, padx=5, pady=5)
+        ttk.Label(self.top_frame, text="Select File:").grid(row=1, column=0, padx=5, pady=5, sticky=tk.W)
+        self.file_combobox = ttk.Combobox(self.top_frame, textvariable=self.selected_file, state="readonly", width=57)
+        self.file_combobox.grid(row=1, column=1, padx=5, pady=5, sticky=tk.EW)
+        self.file_combobox.bind("<<ComboboxSelected>>", self.load_and_display_all)
+        self.progress_label = ttk.Label(self.top_frame, text="Solved: - / - (-.-%)", font=('Helvetica', 10, 'bold'))
+        self.progress_label.grid(row=1, column=2, padx=10, pady=5, sticky=tk.E)
+        self.top_frame.columnconfigure(1, weight=1)
+
+        # --- Status Bar ---
+        self.status_label = ttk.Label(master, text="Load a directory and select a file.", relief=tk.SUNKEN, anchor=tk.W, padding="2 5")
+        self.status_label.pack(side=tk.BOTTOM, fill=tk.X)
+
+        # --- Main Paned Window ---
+        self.paned_window = ttk.PanedWindow(master, orient=tk.VERTICAL)
+        self.paned_window.pack(fill=tk.BOTH, expand=True, side=tk.TOP)
+
+        # --- Top Pane: Scrollable Display Area ---
+        self.display_pane = ttk.Frame(self.paned_window, padding="5")
+        self.paned_window.add(self.display_pane, weight=3)
+        # ... (Canvas/Scrollbar setup for display remains the same) ...
+        self.canvas_display = tk.Canvas(self.display_pane, borderwidth=0)
+        self.scrollable_frame_display = ttk.Frame(self.canvas_display)
+        self.scrollbar_display = ttk.Scrollbar(self.display_pane, orient="vertical", command=self.canvas_display.yview)
+        self.canvas_display.configure(yscrollcommand=self.scrollbar_display.set)
+        self.scrollbar_display.pack(side="right", fill="y")
+        self.canvas_display.pack(side="left", fill="both", expand=True)
+        self.canvas_frame_display_id = self.canvas_display.create_window((0, 0), window=self.scrollable_frame_display, anchor="nw")
+        self.scrollable_frame_display.bind("<Configure>", self._on_display_frame_configure)
+        self.canvas_display.bind('<Configure>', self._on_display_canvas_configure)
+        self.canvas_display.bind("<MouseWheel>", lambda e: self._on_mousewheel(e, self.canvas_display))
+        self.canvas_display.bind("<Button-4>", lambda e: self._on_mousewheel(e, self.canvas_display)) # Linux scroll up
+        self.canvas_display.bind("<Button-5>", lambda e: self._on_mousewheel(e, self.canvas_display)) # Linux scroll down
+
+
+        # --- Bottom Pane: Interactive Solver Area ---
+        self.solver_pane = ttk.Labelframe(self.paned_window, text=" Interactive Solver (Last Test Output) ", padding="10")
+        self.paned_window.add(self.solver_pane, weight=1)
+
+        # --- Solver Control Frame ---
+        solver_controls = ttk.Frame(self.solver_pane)
+        solver_controls.pack(side=tk.LEFT, fill=tk.Y, padx=10)
+
+        # Dimension Controls
+        dim_frame = ttk.Frame(solver_controls)
+        dim_frame.pack(pady=5, anchor='w')
+        # ... (Row/Col entries and Create/Resize button remain the same) ...
+        ttk.Label(dim_frame, text="Rows:").grid(row=0, column=0, padx=2)
+        self.rows_entry = ttk.Entry(dim_frame, textvariable=self.editable_grid_rows, width=4)
+        self.rows_entry.grid(row=0, column=1, padx=2)
+        ttk.Label(dim_frame, text="Cols:").grid(row=0, column=2, padx=2)
+        self.cols_entry = ttk.Entry(dim_frame, textvariable=self.editable_grid_cols, width=4)
+        self.cols_entry.grid(row=0, column=3, padx=2)
+        self.create_grid_button = ttk.Button(dim_frame, text="Create/Resize Grid", command=self.create_or_update_editable_grid, state=tk.DISABLED)
+        self.create_grid_button.grid(row=0, column=4, padx=5)
+
+
+        # Color Palette
+        palette_frame = ttk.Frame(solver_controls)
+        palette_frame.pack(pady=10, anchor='w')
+        # ... (Palette setup remains the same) ...
+        ttk.Label(palette_frame, text="Draw Color:").pack(side=tk.LEFT, padx=(0, 5))
+        self.color_buttons = []
+        for i in range(len(ARC_COLORS_HEX)):
+            btn = tk.Button(palette_frame, text=str(i), bg=ARC_COLORS_HEX[i], width=2, height=1,
+                            relief=tk.RAISED, command=lambda c=i: self.select_draw_color(c))
+            fg_color = TEXT_COLOR_FOR_IDX[i]
+            btn.config(fg=fg_color)
+            btn.pack(side=tk.LEFT, padx=1)
+            self.color_buttons.append(btn)
+        self.select_draw_color(self.current_draw_color)
+
+        # Check Button (Renamed)
+        self.check_button = ttk.Button(solver_controls, text="Check Solution", command=self.check_solution, state=tk.DISABLED)
+        self.check_button.pack(pady=10, anchor='w') # Adjusted padding
+
+        # Feedback Label
+        self.check_feedback_label = ttk.Label(solver_controls, text="", font=('Helvetica', 10, 'italic'))
+        self.check_feedback_label.pack(pady=5, anchor='w')
+
+        # --- Editable Grid Canvas Frame ---
+        grid_canvas_frame = ttk.Frame(self.solver_pane)
+        grid_canvas_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10)
+
+        self.canvas_edit = tk.Canvas(grid_canvas_frame, bg='white', borderwidth=1, relief=tk.SUNKEN)
+        self.canvas_edit.pack(fill=tk.BOTH, expand=True)
+        self.canvas_edit.bind("<Button-1>", self.on_grid_click) # Left-click to draw
+        self.canvas_edit.bind("<B1-Motion>", self.on_grid_click) # Drag to draw
+        self.canvas_edit.bind("<ButtonRelease-1>", self.on_grid_release) # End of a draw stroke
+        self.canvas_edit.bind("<Configure>", self._invalidate_edit_geom) # Canvas resized
+
+    # --- Scroll Setup Methods --- (Remain the same)
+    def _on_display_frame_configure(self, event=None):
+        self.canvas_display.configure(scrollregion=self.canvas_display.bbox("all"))
+    def _on_display_canvas_configure(self, event=None):
+        canvas_width = self.canvas_display.winfo_width()
+        self.canvas_display.itemconfig(self.canvas_frame_display_id, width=canvas_width)
+    def _on_mousewheel(self, event, canvas):
+        delta = 0
+        if event.num == 4: delta = -1
+        elif event.num == 5: delta = 1
+        elif hasattr(event, 'delta') and event.delta < 0: delta = 1
+        elif hasattr(event, 'delta') and event.delta > 0: delta = -1
+        if delta != 0:
+            y_view = canvas.yview()
+            if (delta < 0 and y_view[0] > 0.0) or (delta > 0 and y_view[1] < 1.0):
+                 canvas.yview_scroll(delta, "units")
+
+    # --- Core Application Logic ---
+    def browse_directory(self):
+        # ... (Remains the same, uses normalized path) ...
+        dir_path = filedialog.askdirectory()
+        if dir_path:
+            normalized_dir_path = os.path.normpath(dir_path)
+            self.directory_path.set(normalized_dir_path)
+            self.find_json_files()
+            self.clear_display_area()
+            self.disable_solver()
+            if not self.json_files:
+                 self.status_label.config(text="No .json files found in selected directory.")
+                 self.file_combobox['values'] = []; self.selected_file.set("")
+            else:
+                 self.status_label.config(text="Select a file from the dropdown.")
+
+# --- Inside the ARCViewerApp class ---
+
+    def find_json_files(self):
+        """ Finds .json files, stores the full list, filters dropdown to show only unsolved tasks."""
+        # Keep self.json_files as the full list of files in the directory
+        # Filter only the list shown in the combobox
+        all_json_files_in_dir = [] # Store all found files here
+        dir_path = self.directory_path.get() # Already normalized
+        # File list is about to change; drop the memoized solved count so
+        # update_solved_percentage recomputes it against the fresh scan
+        self._solved_count_per_dir.pop(dir_path, None)
+
+        # Clear previous selections first
+        self.selected_file.set("")
+        self.file_combobox['values'] = []
+
+
+        if os.path.isdir(dir_path):
+            try:
+                # Get all .json files (scandir avoids per-entry stat churn)
+                with os.scandir(dir_path) as entries:
+                    all_json_files_in_dir = sorted(
+                        e.name for e in entries if e.name.lower().endswith('.json')
+                    )
+                self.json_files = all_json_files_in_dir # Store the full list
+                self._json_files_set = frozenset(all_json_files_in_dir)
+
+                # Solved files for this directory (already a set)
+                solved_files_set = self.solutions.get(dir_path, set())
+
+                # Filter the list for the combobox (show only unsolved)
+                unsolved_files = [
+                    f for f in all_json_files_in_dir if f not in solved_files_set
+                ]
+
+                # Update the combobox values
+                self.file_combobox['values'] = unsolved_files
+
+                # Select the first unsolved file, or clear if all are solved
+                if unsolved_files:
+                    self.selected_file.set(unsolved_files[0])
+                    # Automatically load the first unsolved file
+                    # Ensure load_and_display_all is called AFTER the selection is set
+                    # Binding <<ComboboxSelected>> might handle this, but explicit call is safer here
+                    # Using after(0) ensures the set() completes before loading starts
+                    self.master.after(0, self.load_and_display_all)
+                else:
+                    # All tasks solved or directory empty of JSON files
+                    self.clear_display_area() # Clear plots if no file selected
+                    self.disable_solver()    # Disable solver
+                    if all_json_files_in_dir: # Files exist, but all are solved
+                        self.status_label.config(text="All tasks in this directory are marked as solved!")
+                    # else: status handled by browse_directory if directory was empty initially
+
+            except Exception as e:
+                self.status_label.config(text=f"Error reading directory: {e}")
+                self.json_files = [] # Reset full list on error too
+                self._json_files_set = frozenset()
+                self.selected_file.set("")
+                self.file_combobox['values'] = []
+        else:
+            # Directory path is invalid
+            self.json_files = []
+            self._json_files_set = frozenset()
+            self.selected_file.set("")
+            self.file_combobox['values'] = []
+
+        # Update progress based on the full list (self.json_files) vs solutions log
+        # This should be called AFTER self.json_files is updated
+        self.update_solved_percentage()
+
+    def _get_plot_slot(self, index):
+        """ Returns the pooled widget bundle for one example pair, growing the pool on demand. """
+        while len(self._fig_pool) <= index:
+            frame = ttk.Frame(self.scrollable_frame_display, padding=5, relief=tk.GROOVE, borderwidth=1)
+            # Thumbnails are plain labels showing a PhotoImage with the title above
+            label_in = ttk.Label(frame, compound=tk.TOP, justify=tk.CENTER)
+            label_out = ttk.Label(frame, compound=tk.TOP, justify=tk.CENTER)
+            placeholder = ttk.Label(frame, relief=tk.SOLID, padding=10, borderwidth=1, justify=tk.CENTER)
+            self._fig_pool.append({
+                'frame': frame,
+                'label_in': label_in, 'label_out': label_out,
+                'placeholder': placeholder,
+            })
+        return self._fig_pool[index]
+
+    def _set_thumb(self, label, matrix, title):
+        """ Points a thumbnail label at a freshly rendered grid photo. """
+        if matrix is None or matrix.ndim != 2 or matrix.size == 0:
+            label.config(image='', text=f"{title}\n(No data)")
+            label.image = None
+            return
+        photo = render_grid_photo(matrix, cell=_thumb_cell_size(matrix))
+        label.config(image=photo, text=title)
+        label.image = photo # keep a reference so Tk doesn't GC the image
+
+    def _show_plot_slot(self, slot, input_matrix, input_title, output_matrix, output_title):
+        """ Packs a pooled slot and points its thumbnails at the given pair.
+
+        output_matrix=None shows the 'to be predicted' placeholder instead of
+        the output thumbnail; output_title is then used as the placeholder text. """
+        # Re-pack children in a deterministic order (slot may have been
+        # configured differently for the previous task)
+        slot['placeholder'].pack_forget()
+        slot['label_in'].pack_forget(); slot['label_out'].pack_forget()
+
+        self._pack_in_order(slot['frame'], fill=tk.X, pady=5, padx=5)
+        slot['label_in'].pack(side=tk.LEFT, padx=5, pady=5)
+        self._set_thumb(slot['label_in'], input_matrix, input_title)
+
+        if output_matrix is None:
+            slot['placeholder'].config(text=output_title)
+            slot['placeholder'].pack(side=tk.LEFT, padx=5, pady=5, expand=True, fill=tk.BOTH)
+        else:
+            slot['label_out'].pack(side=tk.LEFT, padx=5, pady=5)
+            self._set_thumb(slot['label_out'], output_matrix, output_title)
+
+    def _pooled_widgets(self):
+        """ Top-level pooled children of the scrollable display frame. """
+        widgets = [slot['frame'] for slot in self._fig_pool]
+        if self._train_header is not None: widgets.append(self._train_header)
+        if self._test_header is not None: widgets.append(self._test_header)
+        return widgets
+
+    def clear_display_area(self):
+        # Hide pooled widgets (kept for reuse); destroy anything else
+        pooled = set(self._pooled_widgets())
+        for widget in self.scrollable_frame_display.winfo_children():
+            if widget in pooled:
+                widget.pack_forget()
+            else:
+                widget.destroy()
+        self.canvas_display.yview_moveto(0)
+        self.master.after_idle(self._on_display_frame_configure)
+
+    def _begin_display_update(self):
+        """ Prepares the display for a new task without hiding pooled rows.
+
+        Pooled frames/headers stay packed (they are diffed against the new
+        task by _pack_in_order/_hide_unused_display); only stray non-pooled
+        children such as the 'No examples' label are destroyed. """
+        pooled = set(self._pooled_widgets())
+        for widget in self.scrollable_frame_display.winfo_children():
+            if widget not in pooled:
+                widget.destroy()
+        self._pack_prev = None
+
+    def _pack_in_order(self, widget, **opts):
+        """ Packs a display row directly after the previously packed row, so
+        reused widgets end up in the right order without a full repack. """
+        if self._pack_prev is not None:
+            opts['after'] = self._pack_prev
+        widget.pack(**opts)
+        self._pack_prev = widget
+
+    def _hide_unused_display(self, used_slots, show_train, show_test):
+        """ Hides pool slots and headers the current task doesn't need. """
+        for slot in self._fig_pool[used_slots:]:
+            slot['frame'].pack_forget()
+        if not show_train and self._train_header is not None:
+            self._train_header.pack_forget()
+        if not show_test and self._test_header is not None:
+            self._test_header.pack_forget()
+
+    # --- Inside disable_solver method ---
+    def disable_solver(self):
+        """ Disables solver elements and clears feedback. """
+        self.create_grid_button.config(state=tk.DISABLED)
+        self.check_button.config(state=tk.DISABLED) # Use new button name
+        self.check_feedback_label.config(text="") # Clear feedback
+        self._feedback_cleared = True
+        self.last_test_input_index = -1
+
+        # Set state and IntVars to minimal 1x1
+        self.editable_grid_state = np.zeros((1,1), dtype=np.int8)
+        self.editable_grid_rows.set(1); self.editable_grid_cols.set(1)
+
+        # Clear canvas items fully (the single image item is recreated on draw)
+        self.canvas_edit.delete("all")
+        self._grid_img_id = None
+
+        # Draw the minimal empty 1x1 grid
+        self.draw_editable_grid()
+
+    def enable_solver(self, last_test_index, initial_rows, initial_cols):
+        """ Enables solver elements, sets initial state, clears feedback. """
+        self.last_test_input_index = last_test_index
+        self.editable_grid_rows.set(initial_rows)
+        self.editable_grid_cols.set(initial_cols)
+        self.create_or_update_editable_grid(clear_state=True)
+        self.create_grid_button.config(state=tk.NORMAL)
+        self.check_button.config(state=tk.NORMAL) # Use new button name
+        self.check_feedback_label.config(text="") # Clear feedback
+        self._feedback_cleared = True
+
+
+   # --- Inside the ARCViewerApp class ---
+
+    def load_and_display_all(self, event=None):
+        """ Loads file, displays ALL examples (Train & Test), prepares solver. """
+        file_name = self.selected_file.get()
+        current_dir = self.directory_path.get() # Get normalized path
+        if not file_name or not current_dir: return
+
+        file_path = os.path.join(current_dir, file_name)
+        self.status_label.config(text=f"Loading {file_name}...")
+
+        self._begin_display_update()
+        self.disable_solver() # Disable solver initially
+
+        self.current_task_data = load_data(file_path) # Store current task data
+        if not self.current_task_data:
+            # Error handling done within load_data or subsequent checks
+            self.status_label.config(text=f"Failed to load or parse {file_name}")
+            return
+
+        # Use .get with default empty list for safety
+        train_examples = self.current_task_data.get('train', [])
+        test_examples = self.current_task_data.get('test', [])
+        num_train = len(train_examples)
+        num_test = len(test_examples)
+
+        # Parse correct test outputs once, so Check presses don't rebuild them
+        self._correct_grids_np = [
+            to_grid(p['output']) if 'output' in p else None for p in test_examples
+        ]
+
+        if num_train + num_test == 0:
+            self._hide_unused_display(0, show_train=False, show_test=False)
+            ttk.Label(self.scrollable_frame_display, text="No examples found in this file.").pack(pady=20)
+            self.master.after_idle(self._finalize_load, f"Loaded {file_name}: No examples found.")
+            return
+
+        slot_idx = 0
+
+        # --- Plot Training Examples ---
+        if num_train > 0:
+            if self._train_header is None:
+                self._train_header = ttk.Label(self.scrollable_frame_display, text="--- Training Examples ---", font=('Helvetica', 12, 'bold'))
+            self._pack_in_order(self._train_header, pady=(10, 5), anchor='w', padx=10)
+
+            for i, pair in enumerate(train_examples):
+                # ARC colors fit in int8 - 8x less memory than the int64 default
+                input_matrix = to_grid(pair.get('input', []))
+                output_matrix = to_grid(pair.get('output', []))
+
+                slot = self._get_plot_slot(slot_idx); slot_idx += 1
+                self._show_plot_slot(slot, input_matrix, f"Train {i+1} Input",
+                                     output_matrix, f"Train {i+1} Output")
+
+        # --- Plot Test Examples ---
+        if num_test > 0:
+            if self._test_header is None:
+                self._test_header = ttk.Label(self.scrollable_frame_display, text="--- Test Examples ---", font=('Helvetica', 12, 'bold'))
+            self._pack_in_order(self._test_header, pady=(15, 5), anchor='w', padx=10)
+
+            last_test_input_index = num_test - 1
+
+            for i, pair in enumerate(test_examples):
+                is_last_test = (i == last_test_input_index)
+
+                input_matrix = to_grid(pair.get('input', []))
+                output_matrix = to_grid(pair['output']) if 'output' in pair else None
+
+                slot = self._get_plot_slot(slot_idx); slot_idx += 1
+                if is_last_test or output_matrix is None:
+                    # Output hidden for the task the user has to solve
+                    self._show_plot_slot(slot, input_matrix, f"Test {i+1} Input",
+                                         None, f"Test {i+1} Output\n(To be predicted)")
+                else:
+                    self._show_plot_slot(slot, input_matrix, f"Test {i+1} Input",
+                                         output_matrix, f"Test {i+1} Output")
+
+                # Determine Solver Size and Enable (if last test example)
+                if is_last_test:
+                    # ... (solver dimension determination logic remains the same) ...
+                    expected_rows, expected_cols = 3, 3
+                    determined_from_training = False
+                    if num_train > 0: # Check training outputs (use num_train check)
+                         train_outputs_np = [to_grid(tr_pair.get('output', [])) for tr_pair in train_examples] # Use train_examples
+                         valid_train_outputs = [out for out in train_outputs_np if out.ndim == 2 and out.size > 0]
+                         if valid_train_outputs:
+                            first_shape = valid_train_outputs[0].shape
+                            if all(out.shape == first_shape for out in valid_train_outputs):
+                                expected_rows, expected_cols = first_shape
+                                determined_from_training = True
+                                print(f"Solver size: Using consistent training output dimensions: {expected_rows}x{expected_cols}")
+                            else: print("Solver size: Training output dimensions are inconsistent.")
+                    if not determined_from_training: # Fallback to input
+                         if input_matrix.ndim == 2 and input_matrix.size > 0:
+                            expected_rows, expected_cols = input_matrix.shape
+                            print(f"Solver size: Falling back to input dimensions: {expected_rows}x{expected_cols}")
+                         else: # Absolute fallback
+                             expected_rows, expected_cols = 3, 3
+                             print(f"Solver size: Falling back to default dimensions: {expected_rows}x{expected_cols}")
+                    self.enable_solver(i, expected_rows, expected_cols)
+
+        # Hide whatever the previous task used beyond this one
+        self._hide_unused_display(slot_idx, show_train=num_train > 0, show_test=num_test > 0)
+
+        # --- Final Updates (single deferred pass instead of mid-function
+        # update_idletasks + after(10) callbacks) ---
+        self.master.after_idle(self._finalize_load,
+                               f"Loaded {file_name}: {num_train} train, {num_test} test examples.")
+
+    def _finalize_load(self, status_text):
+        """ One deferred pass after a load: status, scroll region, scroll to top. """
+        self.status_label.config(text=status_text)
+        self._on_display_frame_configure()
+        self.canvas_display.yview_moveto(0)
+
+
+    # --- Interactive Solver Methods ---
+    def select_draw_color(self, color_index):
+        # Kept as np.int8 so compares/stores against editable_grid_state
+        # skip per-event dtype coercion
+        self.current_draw_color = np.int8(color_index)
+        for i, btn in enumerate(self.color_buttons):
+            relief = tk.SUNKEN if i == color_index else tk.RAISED
+            border = 2 if i == color_index else 1
+            btn.config(relief=relief, borderwidth=border)
+
+
+    def create_or_update_editable_grid(self, clear_state=False):
+        """ Resizes internal state, clears canvas, initializes ID storage, and redraws. """
+        try:
+            rows = int(self.editable_grid_rows.get())
+            cols = int(self.editable_grid_cols.get())
+            if not (0 < rows <= 50 and 0 < cols <= 50):
+                 raise ValueError("Grid dimensions must be between 1 and 50.")
+        except ValueError as e:
+            messagebox.showerror("Invalid Dimensions", f"Please enter valid integer dimensions (1-50).\n{e}")
+            if hasattr(self.editable_grid_state, 'shape'):
+                self.editable_grid_rows.set(self.editable_grid_state.shape[0])
+                self.editable_grid_cols.set(self.editable_grid_state.shape[1])
+            return
+
+        # Always clear canvas items fully on resize/create
+        self.canvas_edit.delete("all")
+        self._grid_img_id = None
+
+        # Update internal grid state only if size changed or clear requested
+        if clear_state or (rows, cols) != self.editable_grid_state.shape:
+            print(f"Creating new solver grid state: {rows}x{cols}")
+            self.editable_grid_state = np.zeros((rows, cols), dtype=np.int8)
+        else:
+             # If size is same, ensure state matches new dimensions (e.g., trim/pad if logic was complex)
+             # For simple resize, zeros is fine if size changed, otherwise keep existing state
+             pass
+
+        # Always redraw the canvas fully after resize/create
+        self.draw_editable_grid()
+
+
+    def _compose_grid_rgb(self):
+        """ Builds the full grid image (cells + grid lines) as an HxWx3 uint8 array. """
+        rows, cols = self.editable_grid_state.shape
+        cs = self.cell_size
+        # Clamp out-of-range values to background, then look up RGB per cell
+        state = np.clip(self.editable_grid_state, 0, len(ARC_COLORS_HEX) - 1)
+        cell_rgb = PALETTE_RGB[state] # (rows, cols, 3)
+        # Upscale each cell to cs x cs pixels; +1 so the bottom/right border fits
+        img = np.empty((rows * cs + 1, cols * cs + 1, 3), dtype=np.uint8)
+        img[:-1, :-1] = np.repeat(np.repeat(cell_rgb, cs, axis=0), cs, axis=1)
+        # Stamp grid lines (every cell boundary plus the outer edges)
+        img[::cs, :] = GRID_LINE_RGB
+        img[:, ::cs] = GRID_LINE_RGB
+        img[-1, :] = GRID_LINE_RGB
+        img[:, -1] = GRID_LINE_RGB
+        # Digit overlay baked into the pixels (same threshold as the old
+        # create_text items, but with zero canvas items)
+        if cs >= DIGIT_MIN_CELL_PX:
+            _stamp_digits(img, state, cs)
+        return img
+
+    def _invalidate_edit_geom(self, event=None):
+        """ Drops the cached layout when the editable canvas is resized. """
+        self._edit_geom = None
+
+    def _get_edit_geom(self):
+        """ Returns (cell_size, offset_x, offset_y) for the editable grid.
+
+        Recomputed (including the winfo queries) only when the canvas has
+        been resized or the grid shape changed; otherwise served from cache
+        so redraws and click mapping skip the Tcl round-trips. No
+        update_idletasks here: winfo_width/height report the size from the
+        last completed layout, and the <Configure> binding invalidates the
+        cache whenever that changes, so draining the idle queue inside an
+        event handler would only add a synchronous layout pass. """
+        rows, cols = self.editable_grid_state.shape
+        if rows == 0 or cols == 0: return None
+        if self._edit_geom is not None and self._edit_geom[0] == (rows, cols):
+            return self._edit_geom[1]
+
+        canvas_width = self.canvas_edit.winfo_width() - 4
+        canvas_height = self.canvas_edit.winfo_height() - 4
+        if canvas_width <= 0 or canvas_height <= 0:
+            return None
+
+        cell_size = min(max(1, canvas_width // cols), max(1, canvas_height // rows), 50)
+        offset_x = max(2, (canvas_width - cell_size * cols) // 2)
+        offset_y = max(2, (canvas_height - cell_size * rows) // 2)
+        self._edit_geom = ((rows, cols), (cell_size, offset_x, offset_y))
+        return self._edit_geom[1]
+
+    def draw_editable_grid(self):
+        """ Renders the editable grid into a single PhotoImage and blits it.
+
+        One image item replaces the old per-cell create_rectangle/create_text
+        loop, so a redraw is one Tcl call instead of O(rows*cols). Clicks are
+        mapped back to cells arithmetically in on_grid_click. """
+        rows, cols = self.editable_grid_state.shape
+        if rows == 0 or cols == 0: return
+
+        geom = self._get_edit_geom()
+        if geom is None:
+             self.master.after(100, self.draw_editable_grid); return # Try again later
+        self.cell_size, offset_x, offset_y = geom
+
+        img = self._compose_grid_rgb()
+        h, w = img.shape[:2]
+        # Tk PhotoImage accepts raw PPM (P6) bytes directly - no per-pixel calls
+        ppm = f"P6 {w} {h} 255 ".encode('ascii') + img.tobytes()
+        if (self._grid_photo is not None
+                and self._grid_photo.width() == w and self._grid_photo.height() == h):
+            # Same pixel dimensions: refresh the existing Tk image in place
+            # instead of allocating a new one and rebinding the canvas item
+            self._grid_photo.configure(data=ppm)
+        else:
+            self._grid_photo = tk.PhotoImage(data=ppm)
+
+        if self._grid_img_id is None:
+            self._grid_img_id = self.canvas_edit.create_image(offset_x, offset_y, anchor='nw',
+                                                              image=self._grid_photo)
+        else:
+            self.canvas_edit.coords(self._grid_img_id, offset_x, offset_y)
+            self.canvas_edit.itemconfig(self._grid_img_id, image=self._grid_photo)
+
+
+    def on_grid_click(self, event):
+        """ Handles clicks/drags: maps the event to a cell and repaints it. """
+        if self.check_button['state'] == tk.DISABLED: return # Use check_button name
+
+        rows, cols = self.editable_grid_state.shape
+        if rows <= 0 or cols <= 0: return # Grid not initialized
+
+        # Geometry comes from the <Configure>-invalidated cache; during a
+        # drag this is a plain tuple read instead of Tcl winfo queries
+        geom = self._get_edit_geom()
+        if geom is None:
+            print("Warning: Canvas size invalid in on_grid_click.")
+            return
+        local_cell_size, current_offset_x, current_offset_y = geom
+
+        # Bounds check first: out-of-grid clicks (margins, padding) bail
+        # before any index math, and in-grid clicks then need no clamping
+        dx = event.x - current_offset_x
+        dy = event.y - current_offset_y
+        if not (0 <= dx < local_cell_size * cols and 0 <= dy < local_cell_size * rows):
+            return
+
+        c = dx // local_cell_size
+        r = dy // local_cell_size
+
+        # Coalesce B1-Motion bursts: repeated events in the same cell are no-ops
+        if (r, c) == self._last_drawn_cell: return
+        self._last_drawn_cell = (r, c)
+
+        # Update internal state only if color is different
+        if self.editable_grid_state[r, c] != self.current_draw_color:
+            self.editable_grid_state[r, c] = self.current_draw_color
+            # --- Queue the dirty cell; one flush per idle tick ---
+            # A fast drag across N cells issues one batched repaint pass
+            # instead of N synchronous Tcl calls
+            if self._grid_photo is not None:
+                self._dirty_cells.add((r, c))
+                if not self._flush_scheduled:
+                    self._flush_scheduled = True
+                    self.canvas_edit.after_idle(self._flush_dirty)
+
+            # Clear feedback label when user draws, as previous check is
+            # now invalid; the flag makes this one Tcl call per stroke,
+            # not one per motion event
+            if not self._feedback_cleared:
+                self.check_feedback_label.config(text="")
+                self._feedback_cleared = True
+
+    def _flush_dirty(self):
+        """ Repaints every cell dirtied since the last idle tick. """
+        self._flush_scheduled = False
+        if not self._dirty_cells: return
+        geom = self._get_edit_geom()
+        if geom is None or self._grid_photo is None:
+            self._dirty_cells.clear(); return
+        cs = geom[0]
+        # One whole-grid decision instead of a branch per repainted cell
+        draw_text = cs >= DIGIT_MIN_CELL_PX
+        state = self.editable_grid_state
+        rows, cols = state.shape
+
+        # Group dirty cells by color: the painted block depends only on
+        # (color, cell size), so each distinct color is rendered once and
+        # blitted at every cell that took it
+        by_color = {}
+        for r, c in self._dirty_cells:
+            if r < rows and c < cols: # grid may have been resized meanwhile
+                by_color.setdefault(int(state[r, c]), []).append((r, c))
+        self._dirty_cells.clear()
+
+        put = self._grid_photo.put # bound once; the loops are pure calls
+        for color_idx, cells in by_color.items():
+            fill_hex, text_hex = PAINT_HEX[color_idx]
+            if not draw_text:
+                # Too small for a digit - plain solid fills
+                for r, c in cells:
+                    x1 = c * cs + 1; y1 = r * cs + 1
+                    put(fill_hex, to=(x1, y1, x1 + cs - 1, y1 + cs - 1))
+                continue
+            # Fill + digit glyph as row strings, built once per color.
+            # put() coordinates are image-relative; the 1px grid lines
+            # around each cell are left intact
+            offset = (cs - 8) // 2 # glyph position relative to the cell interior
+            size = cs - 1
+            mask = np.zeros((size, size), dtype=bool)
+            mask[offset:offset + 8, offset:offset + 8] = _DIGIT_GLYPHS[color_idx]
+            data = tuple(' '.join(text_hex if m else fill_hex for m in row) for row in mask)
+            for r, c in cells:
+                put(data, to=(c * cs + 1, r * cs + 1))
+
+    def on_grid_release(self, event):
+        """ End of a draw stroke: reset the same-cell guard and let Tk settle once. """
+        self._last_drawn_cell = None
+        # One deferred settle per stroke instead of per motion event
+        self.canvas_edit.update_idletasks()
+
+
+    def _check_feedback(self, text, color):
+        """ Shows check feedback inline in the label (no modal dialog). """
+        self.check_feedback_label.config(text=text, foreground=color)
+        self._feedback_cleared = False
+
+    def check_solution(self):
+        """ Checks the drawn grid against the correct output and provides feedback.
+            Only marks as solved if correct. """
+        current_file = self.selected_file.get()
+        current_dir = self.directory_path.get()
+
+        # --- Basic Checks ---
+        # Inline feedback instead of modal dialogs: a failed Check should
+        # not spawn a Toplevel and block the event loop
+        if not current_file or not current_dir:
+            self._check_feedback("No directory or task file selected.", "orange")
+            return
+        if self.last_test_input_index < 0:
+             self._check_feedback("Solver not linked to a specific test case.", "orange")
+             return
+        if self.current_task_data is None or 'test' not in self.current_task_data:
+             self._check_feedback("Task data not loaded correctly.", "red")
+             return
+        if not (0 <= self.last_test_input_index < len(self.current_task_data['test'])):
+             self._check_feedback("Invalid test case index.", "red")
+             return
+
+        # --- Get Correct Output (parsed once at load time) ---
+        try:
+            correct_grid_np = self._correct_grids_np[self.last_test_input_index]
+        except IndexError:
+             self._check_feedback("Error accessing correct output.", "red")
+             return
+        if correct_grid_np is None:
+            self._check_feedback("Cannot check: Correct output not available.", "orange")
+            return
+
+        # --- Compare Grids ---
+        # Both sides are contiguous int8 (to_grid / np.zeros), so the
+        # equality check reduces to a bytewise sweep
+        user_grid_np = self.editable_grid_state
+        is_correct = False
+        feedback_text = ""
+        feedback_color = "red" # Default to incorrect
+
+        if user_grid_np.shape != correct_grid_np.shape:
+            feedback_text = f"Incorrect (Wrong dimensions: {user_grid_np.shape} vs {correct_grid_np.shape})"
+        elif grids_equal(user_grid_np, correct_grid_np):
+            is_correct = True
+            feedback_text = "Correct!"
+            feedback_color = "green"
+        else:
+            feedback_text = "Incorrect (Content mismatch)"
+
+        # --- Update Feedback Label ---
+        self._check_feedback(feedback_text, feedback_color)
+
+        # --- Mark as Solved (only if correct) ---
+        if is_correct:
+            self._mark_task_as_solved(current_dir, current_file)
+
+
+# --- Inside the ARCViewerApp class ---
+
+    def _mark_task_as_solved(self, current_dir, current_file):
+        """ Internal helper to log task as solved and kick off a background save.
+
+        The JSON encode + disk write used to run synchronously here,
+        stalling the Check button for the duration (noticeable on slow or
+        network-mounted disks). The worker gets its own snapshot of the
+        solutions dict so the UI thread can keep mutating the original. """
+        solved_set = self.solutions.setdefault(current_dir, set())
+        needs_refresh = False # Flag to check if the set actually changed
+        if current_file not in solved_set:
+            solved_set.add(current_file)
+            needs_refresh = True # Mark that we need to refresh the list later
+
+        # Always try to save, even if already solved (in case file was corrupt before)
+        snapshot = {k: set(v) for k, v in self.solutions.items()}
+        threading.Thread(target=self._persist_solutions_async,
+                         args=(snapshot, current_dir, current_file, needs_refresh),
+                         daemon=True).start()
+
+    def _persist_solutions_async(self, snapshot, current_dir, current_file, needs_refresh):
+        """ Worker thread: writes the solutions log, then hands back to Tk.
+
+        No widget access here - the result is marshalled to the UI thread
+        via after(0, ...). """
+        ok = save_solutions(snapshot, SOLUTION_FILENAME, show_error=False)
+        self.master.after(0, self._on_solutions_saved,
+                          ok, current_dir, current_file, needs_refresh)
+
+    def _on_solutions_saved(self, ok, current_dir, current_file, needs_refresh):
+        """ Back on the UI thread once the background save has finished. """
+        if ok:
+            print(f"Task '{current_file}' status updated in solutions log.")
+            # Update status bar to confirm it's correct
+            status_msg = f"Correct! Task '{current_file}' marked as solved."
+            if not needs_refresh:
+                 status_msg = f"Correct! (Task was already marked as solved)."
+            self.status_label.config(text=status_msg)
+
+            if needs_refresh:
+                # Newly solved and present on disk: bump the memoized count
+                # instead of waiting on a full set intersection
+                if current_file in self._json_files_set:
+                    self._solved_count_per_dir[current_dir] = \
+                        self._solved_count_per_dir.get(current_dir, 0) + 1
+                # Refresh the file list dropdown AFTER saving successfully
+                # This also recalculates percentage and loads the next unsolved task
+                self._schedule_refresh()
+            else:
+                 # If already solved, just update percentage in case json_files list changed
+                 self.update_solved_percentage()
+
+        else: # Save failed
+             self.status_label.config(text=f"Correct, but failed to save solution log.")
+             # Revert the change in memory if save failed AND if it was newly added
+             if needs_refresh and current_dir in self.solutions:
+                self.solutions[current_dir].discard(current_file)
+                if not self.solutions[current_dir]:
+                    del self.solutions[current_dir]
+
+
+    def _schedule_refresh(self):
+        """ Debounced find_json_files: many marks within 200ms refresh once.
+
+        Rescanning the directory and rebuilding the dropdown is the
+        expensive part of marking a task solved; cancel-and-reschedule
+        collapses rapid bursts into a single refresh. """
+        if self._refresh_after_id is not None:
+            self.master.after_cancel(self._refresh_after_id)
+        self._refresh_after_id = self.master.after(200, self._do_refresh)
+
+    def _do_refresh(self):
+        self._refresh_after_id = None
+        self.find_json_files()
+
+    def update_solved_percentage(self):
+        # ... (Remains the same as previous version) ...
+        current_dir = self.directory_path.get()
+        if not current_dir or not os.path.isdir(current_dir) or not self.json_files:
+            self.progress_label.config(text="Solved: - / - (-.-%)"); return
+        total_tasks_in_dir = len(self.json_files)
+        if total_tasks_in_dir == 0:
+             self.progress_label.config(text="Solved: 0 / 0 (0.0%)"); return
+        # Memoized count, incremented on new marks and invalidated when the
+        # directory is rescanned; the set intersection only runs on a miss
+        solved_count = self._solved_count_per_dir.get(current_dir)
+        if solved_count is None:
+            solved_count = len(self._json_files_set & self.solutions.get(current_dir, set()))
+            self._solved_count_per_dir[current_dir] = solved_count
+        percent = (solved_count / total_tasks_in_dir) * 100
+        progress_text = f"Solved: {solved_count} / {total_tasks_in_dir} ({percent:.1f}%)"
+        self.progress_label.config(text=progress_text)
+
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    root = tk.Tk()
+    # Define app instance globally ONLY if needed by helpers like load_data
+    # It's generally better to pass 'app' or 'status_label' explicitly if required
+    app = ARCViewerApp(root)
+
+    # Schedule the INITIAL grid creation and drawing AFTER the window is ready
+    # This ensures canvas has size and ID lists are correctly initialized.
+    root.after_idle(app.create_or_update_editable_grid) # CORRECTED LINE
+
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,110 @@
+"""Grid kernels for the ARC viewer/solver.
+
+Hot inner loops (equality checks, color counts, component labelling) live
+here so they can be compiled with Numba. When numba is not installed the
+module falls back to plain numpy implementations with the same signatures.
+Grids are expected as 2-D int8 arrays (see load_and_display_all), which
+keeps the compiled loops tight and SIMD-friendly.
+"""
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+if numba is not None:
+
+    @numba.njit(cache=True)
+    def grids_equal(a, b):
+        """ True if a and b have identical shape and contents. """
+        if a.shape[0] != b.shape[0] or a.shape[1] != b.shape[1]:
+            return False
+        for i in range(a.shape[0]):
+            for j in range(a.shape[1]):
+                if a[i, j] != b[i, j]:
+                    return False
+        return True
+
+    @numba.njit(cache=True)
+    def count_color(a, color):
+        """ Number of cells in a equal to color. """
+        n = 0
+        for i in range(a.shape[0]):
+            for j in range(a.shape[1]):
+                if a[i, j] == color:
+                    n += 1
+        return n
+
+    @numba.njit(cache=True)
+    def connected_components(a):
+        """ Labels 4-connected same-color regions.
+
+        Returns (labels, count) where labels is an int32 array with values
+        1..count and count is the number of components found. """
+        rows, cols = a.shape
+        labels = np.zeros((rows, cols), dtype=np.int32)
+        stack = np.empty((rows * cols, 2), dtype=np.int32)
+        current = 0
+        for i in range(rows):
+            for j in range(cols):
+                if labels[i, j] != 0:
+                    continue
+                current += 1
+                color = a[i, j]
+                labels[i, j] = current
+                stack[0, 0] = i; stack[0, 1] = j
+                top = 1
+                while top > 0:
+                    top -= 1
+                    r = stack[top, 0]; c = stack[top, 1]
+                    if r > 0 and labels[r - 1, c] == 0 and a[r - 1, c] == color:
+                        labels[r - 1, c] = current
+                        stack[top, 0] = r - 1; stack[top, 1] = c; top += 1
+                    if r + 1 < rows and labels[r + 1, c] == 0 and a[r + 1, c] == color:
+                        labels[r + 1, c] = current
+                        stack[top, 0] = r + 1; stack[top, 1] = c; top += 1
+                    if c > 0 and labels[r, c - 1] == 0 and a[r, c - 1] == color:
+                        labels[r, c - 1] = current
+                        stack[top, 0] = r; stack[top, 1] = c - 1; top += 1
+                    if c + 1 < cols and labels[r, c + 1] == 0 and a[r, c + 1] == color:
+                        labels[r, c + 1] = current
+                        stack[top, 0] = r; stack[top, 1] = c + 1; top += 1
+        return labels, current
+
+else:
+
+    def grids_equal(a, b):
+        """ True if a and b have identical shape and contents. """
+        return a.shape == b.shape and np.array_equal(a, b)
+
+    def count_color(a, color):
+        """ Number of cells in a equal to color. """
+        return int(np.count_nonzero(a == color))
+
+    def connected_components(a):
+        """ Labels 4-connected same-color regions (numpy/BFS fallback).
+
+        Returns (labels, count) where labels is an int32 array with values
+        1..count and count is the number of components found. """
+        rows, cols = a.shape
+        labels = np.zeros((rows, cols), dtype=np.int32)
+        current = 0
+        for i in range(rows):
+            for j in range(cols):
+                if labels[i, j] != 0:
+                    continue
+                current += 1
+                color = a[i, j]
+                labels[i, j] = current
+                stack = [(i, j)]
+                while stack:
+                    r, c = stack.pop()
+                    for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+                        if (0 <= nr < rows and 0 <= nc < cols
+                                and labels[nr, nc] == 0 and a[nr, nc] == color):
+                            labels[nr, nc] = current
+                            stack.append((nr, nc))
+        return labels, current